@@ -1,6 +1,5 @@
 """This Module allows for copying a password directly to the clipboard"""
 from time import sleep
-from os import path
 from pyperclip import copy, paste
 from libpkpass.commands.command import Command
 from libpkpass.password import PasswordEntry
@@ -21,8 +20,7 @@ class Clip(Command):
         """ Run function for class.                                      """
         ####################################################################
         password = PasswordEntry()
-        password.read_password_data(path.join(
-            self.args['pwstore'], self.args['pwname']))
+        password.read_password_data(self.pw_path)
         myidentity = self.identities.iddb[self.args['identity']]
 
         plaintext_pw = password.decrypt_entry(
@@ -10,6 +10,11 @@ from libpkpass.identities import IdentityDB
 from libpkpass.password import PasswordEntry
 from libpkpass.util import collect_args, color_prepare
 
+# we want a multi-dim of tuples, this way if more combinations come up
+# that would be required in a 1 or more capacity, we just add
+# a tuple to this tuple
+COMBINATORIAL_ARGS = (('certpath', 'connect'),)
+
     ##########################################################################
 class Command():
     """ Base class for all commands.  Auotmatically registers with cli subparser
@@ -97,13 +102,20 @@ class Command():
         if self.args['pwstore'] in pwd_pwname:
             self.args['pwname'] = pwd_pwname.replace(self.args['pwstore'] + sep, '')
 
+        ##################################################################
+    @property
+    def pw_path(self):
+        """ Path of the password this command acts on """
+        ##################################################################
+        return path.join(self.args['pwstore'], self.args['pwname'])
+
         ##################################################################
     def safety_check(self):
         """ This provides a sanity check that you are the owner of a password."""
         ##################################################################
         try:
             password = PasswordEntry()
-            password.read_password_data(path.join(self.args['pwstore'], self.args['pwname']))
+            password.read_password_data(self.pw_path)
             return (self.args['identity'] in password['recipients'].keys(), password['metadata']['creator'])
         except PasswordIOError:
             return (True, None)
@@ -113,7 +125,7 @@ class Command():
         """Fully updated a password record"""
         ##################################################################
         pass_entry = PasswordEntry()
-        pass_entry.read_password_data(path.join(self.args['pwstore'], self.args['pwname']))
+        pass_entry.read_password_data(self.pw_path)
         swap_pass = PasswordEntry()
         swap_pass.add_recipients(secret=pass_value,
                                  distributor=self.args['identity'],
@@ -124,7 +136,7 @@ class Command():
                                  pwstore=self.args['pwstore']
                                 )
         pass_entry['recipients'][self.args['identity']] = swap_pass['recipients'][self.args['identity']]
-        pass_entry.write_password_data(path.join(self.args['pwstore'], self.args['pwname']),
+        pass_entry.write_password_data(self.pw_path,
                                        overwrite=self.args['overwrite'])
 
         ##################################################################
@@ -155,7 +167,7 @@ class Command():
                                 pwstore=self.args['pwstore']
                                )
 
-        password.write_password_data(path.join(self.args['pwstore'], self.args['pwname']),
+        password.write_password_data(self.pw_path,
                                      overwrite=self.args['overwrite'])
 
         ##################################################################
@@ -175,7 +187,7 @@ class Command():
     def delete_pass(self):
         """This deletes a password that the user has created, useful for testing"""
         ##################################################################
-        filepath = path.join(self.args['pwstore'], self.args['pwname'])
+        filepath = self.pw_path
         try:
             remove(filepath)
         except OSError:
@@ -185,7 +197,7 @@ class Command():
     def rename_pass(self):
         """This renames a password that the user has created"""
         ##################################################################
-        oldpath = path.join(self.args['pwstore'], self.args['pwname'])
+        oldpath = self.pw_path
         newpath = path.join(self.args['pwstore'], self.args['rename'])
         try:
             rename(oldpath, newpath)
@@ -207,18 +219,15 @@ class Command():
     def _build_recipient_list(self):
         """take groups and users and make a SOA for the recipients"""
         ##################################################################
-        try:
-            if 'groups' in self.args and self.args['groups']:
-                self.recipient_list += self._parse_group_membership()
-            if 'users' in self.args and self.args['users']:
-                self.recipient_list += self.args['users']
-            self.recipient_list = [x.strip() for x in list(set(self.recipient_list))]
-            self.escrow_and_recipient_list = self.recipient_list + self.args['escrow_users']
-            for user in self.escrow_and_recipient_list:
-                if str(user) == '':
-                    raise NullRecipientError
-        except KeyError:  # If this is a command with no users, don't worry about it
-            pass
+        if 'groups' in self.args and self.args['groups']:
+            self.recipient_list += self._parse_group_membership()
+        if 'users' in self.args and self.args['users']:
+            self.recipient_list += self.args['users']
+        self.recipient_list = list(dict.fromkeys(x.strip() for x in self.recipient_list))
+        escrow_users = self.args.get('escrow_users') or []
+        self.escrow_and_recipient_list = self.recipient_list + escrow_users
+        if '' in self.escrow_and_recipient_list:
+            raise NullRecipientError
 
         ##################################################################
     def _parse_group_membership(self):
@@ -246,17 +255,8 @@ class Command():
             we do not need both of these arguments but at least one is
             required"""
         ##################################################################
-        # we want a multi-dim of lists, this way if more combinations come up
-        # that would be required in a 1 or more capacity, we just add
-        # a list to this list
-        args_list = [['certpath', 'connect']]
-        for arg_set in args_list:
-            valid = False
-            for arg in arg_set:
-                if arg in self.args and self.args[arg] is not None:
-                    valid = True
-                    break
-            if not valid:
+        for arg_set in COMBINATORIAL_ARGS:
+            if not any(self.args.get(arg) is not None for arg in arg_set):
                 raise CliArgumentError(
                     "'%s' or '%s' is required" % tuple(arg_set))
 
@@ -266,19 +266,19 @@ class Command():
         ##################################################################
         if not swap_list:
             swap_list = self.escrow_and_recipient_list
+        known = self.identities.iddb
         for recipient in swap_list:
-            self.identities.verify_identity(recipient, [])
-            if recipient not in self.identities.iddb.keys():
+            if recipient not in known:
                 raise CliArgumentError(
                     "Error: Recipient '%s' is not in the recipient database" %
                     recipient)
+            self.identities.verify_identity(recipient)
 
-        if self.args['identity'] in self.identities.iddb.keys():
-            self.identities.verify_identity(self.args['identity'], [])
-        else:
+        if self.args['identity'] not in known:
             raise CliArgumentError(
                 "Error: Your user '%s' is not in the recipient database" %
                 self.args['identity'])
+        self.identities.verify_identity(self.args['identity'])
 
         ##################################################################
     def _print_debug(self):
@@ -299,7 +299,12 @@ class Command():
         """Allow a command to print off a progress bar"""
         ##################################################################
         percent = float(value) / endvalue
+        display_percent = int(round(percent * 100))
+        # callers advance one item per call, so skip redrawing when the previous
+        # item already showed this percentage; the first and last items always draw
+        if 1 < value < endvalue and display_percent == int(round((value - 1) * 100.0 / endvalue)):
+            return
         arrow = '-' * int(round(percent * bar_length)-1) + '>'
         spaces = ' ' * (bar_length - len(arrow))
-        stdout.write("\rPercent: [{0}] {1}%".format(arrow + spaces, int(round(percent * 100))))
+        stdout.write("\rPercent: [{0}] {1}%".format(arrow + spaces, display_percent))
         stdout.flush()
@@ -1,5 +1,4 @@
 """This module allows for inspecting metadata passwords"""
-from os import path
 from datetime import datetime
 from libpkpass.password import PasswordEntry
 from libpkpass.commands.command import Command
@@ -18,7 +17,7 @@ class Info(Command):
         """ Run function for class.                                      """
         ####################################################################
         password = PasswordEntry()
-        password.read_password_data(path.join(self.args['pwstore'], self.args['pwname']))
+        password.read_password_data(self.pw_path)
 
         # Metadata
         print(self.color_print("Metadata:", "first_level"))
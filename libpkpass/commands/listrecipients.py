@@ -21,9 +21,9 @@ class Listrecipients(Command):
             print('Key store: "%s"' % self.args['keypath'])
             print('CA Bundle file: "%s"' % self.args['cabundle'])
             print('Looking for Key Extension: "%s"' %
-                  self.identities.extensions['key'])
+                  ", ".join(self.identities.extensions['key']))
             print('Looking for Certificate Extension: "%s"' %
-                  self.identities.extensions['certificate'])
+                  list(self.identities.extensions['certificate']))
 
             print("Loaded %s identities:\n" % len(self.identities.iddb.keys()))
 
@@ -1,5 +1,4 @@
 """This Module allows for editing metadata of passwords"""
-from os import path
 from libpkpass.commands.command import Command
 from libpkpass.password import PasswordEntry
 from libpkpass.errors import CliArgumentError
@@ -16,7 +15,7 @@ class Modify(Command):
     def _run_command_execution(self):
         """ Run function for class.                                      """
         ####################################################################
-        full_path = path.join(self.args['pwstore'], self.args['pwname'])
+        full_path = self.pw_path
         password = PasswordEntry()
         password.read_password_data(full_path)
         editable = ['authorizer', 'description']
@@ -1,5 +1,4 @@
 """This module allows for the renaming of passwords"""
-import os
 import sys
 from libpkpass.commands.command import Command
 from libpkpass.password import PasswordEntry
@@ -27,7 +26,7 @@ class Rename(Command):
             if resafe or self.args['overwrite']:
                 myidentity = self.identities.iddb[self.args['identity']]
                 password = PasswordEntry()
-                password.read_password_data(os.path.join(self.args['pwstore'], self.args['pwname']))
+                password.read_password_data(self.pw_path)
                 plaintext_pw = password.decrypt_entry(
                     identity=myidentity, passphrase=self.passphrase, card_slot=self.args['card_slot'])
                 self._confirmation(plaintext_pw)
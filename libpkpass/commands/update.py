@@ -1,6 +1,5 @@
 """This module allows for the updating of passwords"""
 import getpass
-from os import path
 import libpkpass.util as util
 from libpkpass.password import PasswordEntry
 from libpkpass.commands.command import Command
@@ -22,8 +21,7 @@ class Update(Command):
         """ Run function for class.                                      """
         ####################################################################
         password = PasswordEntry()
-        password.read_password_data(path.join(
-            self.args['pwstore'], self.args['pwname']))
+        password.read_password_data(self.pw_path)
         safe, owner = self.safety_check()
         if safe or self.args['overwrite']:
             self.recipient_list = password['recipients'].keys()
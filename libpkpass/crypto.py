@@ -3,7 +3,7 @@
 from base64 import urlsafe_b64decode, urlsafe_b64encode
 from tempfile import NamedTemporaryFile
 from os import unlink
-from hashlib import sha256
+from hashlib import sha1, sha256
 from shutil import get_terminal_size
 from subprocess import Popen, PIPE, STDOUT, DEVNULL
 from pem import parse_file
@@ -14,6 +14,9 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from libpkpass.util import color_prepare
 from libpkpass.errors import EncryptionError, DecryptionError, SignatureCreationError, X509CertificateError
 
+# uppercase hex pair for every byte value, used to format fingerprints
+HEX_PAIRS = tuple('%02X' % byte for byte in range(256))
+
     ##############################################################################
 def handle_python_strings(string):
     """handles py2/3 incompatiblities"""
@@ -182,7 +185,20 @@ def get_cert_fingerprint(cert):
     """ Return the modulus of the x509 certificate of the identity """
     ##############################################################################
     # SHA1 Fingerprint=F9:9D:71:54:55:BE:99:24:6A:5E:E0:BB:48:F9:63:AE:A2:05:54:98
-    return get_cert_element(cert, 'fingerprint').split('=')[1]
+    # computed in process rather than shelling out to `openssl x509 -fingerprint`
+    # ssl is slow to import and only needed here
+    from ssl import PEM_cert_to_DER_cert #pylint: disable=import-outside-toplevel
+    try:
+        der = PEM_cert_to_DER_cert(handle_python_strings(cert).decode("UTF-8").strip())
+    except (ValueError, UnicodeDecodeError) as err:
+        raise X509CertificateError(str(err))
+    return hexify_colon(sha1(der).digest())
+
+    ##############################################################################
+def hexify_colon(digest):
+    """ Format a digest as colon separated uppercase hex pairs """
+    ##############################################################################
+    return ':'.join(map(HEX_PAIRS.__getitem__, digest))
 
     ##############################################################################
 def get_cert_subject(cert):
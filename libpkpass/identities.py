@@ -1,11 +1,79 @@
 """This Module handles the identitydb object"""
-from os import path, makedirs, listdir
-from tempfile import gettempdir
-from threading import Thread
+from sys import stderr
+from os import path, makedirs, scandir, cpu_count, chmod, replace, unlink
+from tempfile import gettempdir, NamedTemporaryFile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import import_module
 from pem import parse_file
-from libpkpass.crypto import pk_verify_chain, get_cert_fingerprint, get_cert_subject,\
-    get_cert_issuer, get_cert_enddate, get_cert_issuerhash, get_cert_subjecthash
-from libpkpass.errors import FileOpenError, CliArgumentError
+from libpkpass.crypto import handle_python_strings, pk_verify_chain, get_cert_fingerprint,\
+    get_cert_subject, get_cert_issuer, get_cert_enddate, get_cert_issuerhash, get_cert_subjecthash
+from libpkpass.errors import PKPassError, FileOpenError, CliArgumentError
+
+# verification shells out to openssl, so allow more workers than cores
+# without spawning one thread per identity
+MAX_VERIFY_WORKERS = min(32, (cpu_count() or 1) * 4)
+
+# connector name -> connector class, filled in as connectors are first used
+_CONNECTORS = {}
+
+    ##########################################################################
+def _get_connector(name):
+    """ Return the connector class `name` from the module of the same name, lowercased """
+    ##########################################################################
+    connector = _CONNECTORS.get(name)
+    if connector is None:
+        connector = _CONNECTORS[name] = getattr(import_module(name.lower()), name)
+    return connector
+
+    ##########################################################################
+@lru_cache(maxsize=1024)
+def _parse_pem_cached(certificate_path, mtime): #pylint: disable=unused-argument
+    """ Return the certificates in a pem file; mtime is only part of the cache key """
+    ##########################################################################
+    return tuple(cert.as_bytes() for cert in parse_file(certificate_path))
+
+    ##########################################################################
+@lru_cache(maxsize=4096)
+def _get_cert_details(cert, cabundle, cabundle_mtime): #pylint: disable=unused-argument
+    """ Return the verification status and x509 details of a certificate,
+        caching on the certificate contents and the ca bundle path and mtime """
+    ##########################################################################
+    return {
+        'cert_bytes': cert,
+        'verified': pk_verify_chain(cert, cabundle),
+        'fingerprint': get_cert_fingerprint(cert),
+        'subject': get_cert_subject(cert),
+        'issuer': get_cert_issuer(cert),
+        'enddate': get_cert_enddate(cert),
+        'issuerhash': get_cert_issuerhash(cert),
+        'subjecthash': get_cert_subjecthash(cert),
+    }
+
+    ##########################################################################
+def _write_cert_file(filepath, data):
+    """ Atomically write certificate data, leaving an identical file untouched
+        so its mtime stays valid as a cache key                             """
+    ##########################################################################
+    try:
+        if path.getsize(filepath) == len(data):
+            with open(filepath, 'rb') as certfile:
+                if certfile.read() == data:
+                    return
+    except OSError:
+        pass
+    tmpcert = NamedTemporaryFile(dir=path.dirname(filepath), delete=False)
+    try:
+        with tmpcert:
+            tmpcert.write(data)
+        # temporary files are 0600, certificates are public and the default
+        # cache directory is shared between users
+        chmod(tmpcert.name, 0o644)
+        replace(tmpcert.name, filepath)
+    except BaseException:
+        # a leftover file would make the cache directory look populated
+        unlink(tmpcert.name)
+        raise
 
     ##########################################################################
 class IdentityDB():
@@ -16,8 +84,8 @@ class IdentityDB():
         #######################################################################
     def __init__(self):
         #######################################################################
-        self.extensions = {'certificate': ['.cert', '.crt'],
-                           'key': '.key'}
+        self.extensions = {'certificate': ('.cert', '.crt'),
+                           'key': ('.key',)}
         self.cabundle = ""
         self.iddb = {}
 
@@ -41,16 +109,18 @@ class IdentityDB():
         else:
             temp_dir = str(gettempdir())
 
+        cert_ext = self.extensions['certificate'][0]
         for key, value in connection_map.items():
-            connector = getattr(__import__(key.lower(), fromlist=[key]), key)(value)
+            connector = _get_connector(key)(value)
             dirname = path.join(temp_dir, str(key))
-            if not path.exists(dirname):
-                makedirs(dirname)
-            if nocache or not listdir(dirname):
+            makedirs(dirname, exist_ok=True)
+            with scandir(dirname) as entries:
+                empty = next(entries, None) is None
+            if nocache or empty:
                 certs = connector.list_certificates()
                 for name, certlist in certs.items():
-                    with open(path.join(dirname, str(name)) +  str(self.extensions['certificate'][0]), 'w') as tmpcert:
-                        tmpcert.write("\n".join(certlist))
+                    _write_cert_file(path.join(dirname, str(name)) + cert_ext,
+                                     b"\n".join(handle_python_strings(cert) for cert in certlist))
 
             self._load_from_directory(dirname, 'certificate')
 
@@ -59,16 +129,18 @@ class IdentityDB():
         """ Helper function to read in (keys|certs) and store them correctly """
         #######################################################################
         try:
-            for fname in listdir(fpath):
-                if fname.endswith(tuple(self.extensions[filetype])):
-                    uid = fname.split('.')[0]
-                    filepath = path.join(fpath, fname)
-                    try:
-                        self.iddb[uid]["%s_path" % filetype] = filepath
-                    except KeyError as error:
-                        identity = {'uid': fname.split('.')[0],
-                                    "%s_path" % filetype: filepath}
-                        self.iddb[identity['uid']] = identity
+            extensions = self.extensions[filetype]
+            key = "%s_path" % filetype
+            with scandir(fpath) as entries:
+                for entry in entries:
+                    fname = entry.name
+                    if fname.endswith(extensions):
+                        uid = path.splitext(fname)[0]
+                        identity = self.iddb.get(uid)
+                        if identity is None:
+                            self.iddb[uid] = {'uid': uid, key: entry.path}
+                        else:
+                            identity[key] = entry.path
         except OSError as error:
             raise FileOpenError(fpath, str(error.strerror))
 
@@ -80,41 +152,46 @@ class IdentityDB():
                                   nocache=False):
         """ Read in all x509 certificates from directory and name them as found """
         #######################################################################
+        if nocache:
+            # verification results also depend on the current time, so re-check
+            _get_cert_details.cache_clear()
         if certpath:
             self._load_from_directory(certpath, 'certificate')
         if connectmap:
             self._load_certs_from_external(connectmap, nocache)
         if verify_on_load:
-            threads = []
-            for identity, _ in self.iddb.items():
-                threads.append(Thread(target=self.verify_identity,
-                                      args=(identity, [])))
-                threads[-1].start()
-            for thread in threads:
-                thread.join()
+            with ThreadPoolExecutor(max_workers=MAX_VERIFY_WORKERS) as executor:
+                list(executor.map(self._verify_identity_on_load, list(self.iddb)))
+
+        #######################################################################
+    def _verify_identity_on_load(self, identity):
+        """ Verify an identity, reporting rather than raising errors so one bad
+            entry does not stop the rest of the database from loading       """
+        #######################################################################
+        try:
+            self.verify_identity(identity)
+        except (PKPassError, OSError) as err:
+            print("Error verifying identity '%s': %s" % (identity, getattr(err, 'msg', err)),
+                  file=stderr)
 
         #######################################################################
-        # we need the results parameter because of the threading
-    def verify_identity(self, identity, results): #pylint: disable=unused-argument
+    def verify_identity(self, identity, results=None): #pylint: disable=unused-argument
         """ Read in all rsa keys from directory and name them as found
-        results is a meaningless parameter, but is required to make threading work
+        results is unused and only kept for backwards compatibility
         """
         #######################################################################
         try:
             self.iddb[identity]['cabundle'] = self.cabundle
             self.iddb[identity]['certs'] = []
-            for cert in parse_file(self.iddb[identity]['certificate_path']):
-                cert = cert.as_bytes()
-                cert_dict = {}
-                cert_dict['cert_bytes'] = cert
-                cert_dict['verified'] = pk_verify_chain(cert, self.iddb[identity]['cabundle'])
-                cert_dict['fingerprint'] = get_cert_fingerprint(cert)
-                cert_dict['subject'] = get_cert_subject(cert)
-                cert_dict['issuer'] = get_cert_issuer(cert)
-                cert_dict['enddate'] = get_cert_enddate(cert)
-                cert_dict['issuerhash'] = get_cert_issuerhash(cert)
-                cert_dict['subjecthash'] = get_cert_subjecthash(cert)
-                self.iddb[identity]['certs'].append(cert_dict)
+            certificate_path = self.iddb[identity]['certificate_path']
+            cabundle = self.iddb[identity]['cabundle']
+            try:
+                cabundle_mtime = path.getmtime(cabundle)
+            except OSError:
+                cabundle_mtime = None
+            for cert in _parse_pem_cached(certificate_path, path.getmtime(certificate_path)):
+                cert_dict = _get_cert_details(cert, cabundle, cabundle_mtime)
+                self.iddb[identity]['certs'].append(dict(cert_dict))
         except KeyError:
             raise CliArgumentError(
                 "Error: Recipient '%s' is not in the recipient database" % identity)
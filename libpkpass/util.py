@@ -1,19 +1,53 @@
 #!/usr/bin/env python3
 """General Utility file for common functionality"""
-from os import path
-from json import loads
+from os import path, stat, replace, unlink
+from tempfile import NamedTemporaryFile
+from json import loads, dumps
+from collections import OrderedDict
+from copy import deepcopy
+from types import MappingProxyType
 from getpass import getuser
 from sys import argv
 from re import search, error
 from fnmatch import filter as fnfilter
 from argparse import _SubParsersAction
-from yaml import safe_load
+from yaml import load
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 from yaml.parser import ParserError
 from yaml.scanner import ScannerError
 from colored import fg, attr
 from libpkpass import __version__
 from libpkpass.errors import FileOpenError, JsonArgumentError, ConfigParseError
 
+DEFAULT_ARGS = MappingProxyType({
+    'ignore_decrypt': False,
+    'cabundle': './certs/ca-bundle',
+    'keypath': './private',
+    'pwstore': './passwords',
+    'time': 10,
+    'card_slot': None,
+    'certpath': None,
+    'escrow_users': None,
+    'min_escrow': None,
+    'no_cache': False,
+    'noverify': None,
+    'noescrow': False,
+    'overwrite': False,
+    'recovery': False,
+    'rules': 'default',
+    'stdin': False,
+    'theme_map': None,
+    'color': True,
+    'verbosity': 0,
+})
+
+# absolute config path -> (mtime, size, parsed config)
+_YAML_CACHE = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
     ####################################################################
 def color_prepare(string, color_type, colorize, theme_map=None):
     """Handle the color output of a given string"""
@@ -138,28 +172,7 @@ def collect_args(parsedargs):
     ##################################################################
     # Build a dict out of the argparse args Namespace object and a dict from any
     # configuration files and merge the two with cli taking priority
-    args = {
-        'ignore_decrypt': False,
-        'identity': getuser(),
-        'cabundle': './certs/ca-bundle',
-        'keypath': './private',
-        'pwstore': './passwords',
-        'time': 10,
-        'card_slot': None,
-        'certpath': None,
-        'escrow_users': None,
-        'min_escrow': None,
-        'no_cache': False,
-        'noverify': None,
-        'noescrow': False,
-        'overwrite': False,
-        'recovery': False,
-        'rules': 'default',
-        'stdin': False,
-        'theme_map': None,
-        'color': True,
-        'verbosity': 0,
-    }
+    args = dict(DEFAULT_ARGS, identity=getuser())
     cli_args = parsedargs if isinstance(parsedargs, dict) else vars(parsedargs)
     config_args = get_config_args(cli_args['config'], cli_args)
     args.update(config_args)
@@ -185,12 +198,69 @@ def get_config_args(config, cli_args):
     """Return the configuration from the config file"""
     ##################################################################
     try:
-        with open(config, 'r') as fname:
-            config_args = safe_load(fname)
-        return config_args if config_args else {}
+        return _load_yaml_cached(config)
     except IOError:
         if cli_args['verbosity'] != -1:
             print("INFO: No .pkpassrc file found")
         return {}
     except (ParserError, ScannerError):
         raise ConfigParseError("Parsing error with config file, please check syntax")
+
+    ##################################################################
+def _load_yaml_cached(config):
+    """Load a yaml file, reusing the previous parse if the file is unchanged"""
+    ##################################################################
+    config = path.abspath(config)
+    stats = stat(config)
+    cached = _YAML_CACHE.get(config)
+    if cached and cached[0] == stats.st_mtime and cached[1] == stats.st_size:
+        _YAML_CACHE.move_to_end(config)
+        return deepcopy(cached[2])
+    config_args = _read_config_sidecar(config, stats)
+    if config_args is None:
+        with open(config, 'r') as fname:
+            config_args = load(fname, Loader=YamlLoader)
+        config_args = config_args if config_args else {}
+        _write_config_sidecar(config, stats, config_args)
+    _YAML_CACHE[config] = (stats.st_mtime, stats.st_size, config_args)
+    _YAML_CACHE.move_to_end(config)
+    if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+    return deepcopy(config_args)
+
+    ##################################################################
+def _read_config_sidecar(config, stats):
+    """Return the json config stored next to the yaml if it is current"""
+    ##################################################################
+    try:
+        with open(config + '.cache', 'r') as fname:
+            cached = loads(fname.read())
+        if cached['mtime'] == stats.st_mtime and cached['size'] == stats.st_size:
+            return cached['config']
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+    return None
+
+    ##################################################################
+def _write_config_sidecar(config, stats, config_args):
+    """Store the parsed config as json next to the yaml, tagged with its stats"""
+    ##################################################################
+    # only configs that survive a json round trip unchanged can be cached,
+    # e.g. yaml dates or non-string keys would come back different
+    try:
+        data = dumps({'mtime': stats.st_mtime, 'size': stats.st_size, 'config': config_args})
+    except (TypeError, ValueError):
+        return
+    if loads(data)['config'] != config_args:
+        return
+    # the cache is only an optimization, an unwritable directory is fine
+    try:
+        tmpfile = NamedTemporaryFile(mode='w', dir=path.dirname(config), delete=False)
+    except OSError:
+        return
+    try:
+        with tmpfile:
+            tmpfile.write(data)
+        replace(tmpfile.name, config + '.cache')
+    except OSError:
+        unlink(tmpfile.name)
@@ -52,6 +52,13 @@ class TestBasicFunction(unittest.TestCase):
             fingerprint = crypto.get_cert_fingerprint(identity['certs'][0]['cert_bytes'])
             self.assertTrue(len(fingerprint.split(':')) == 20)
 
+    def test_cert_fingerprint_matches_openssl(self):
+        """Verify the in process fingerprint matches openssl"""
+        for _, identity in self.identities.iddb.items():
+            cert = identity['certs'][0]['cert_bytes']
+            self.assertEqual(crypto.get_cert_fingerprint(cert),
+                             crypto.get_cert_element(cert, 'fingerprint').split('=')[1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,13 @@
 """This Module tests iddb module"""
 import unittest
 import os.path
+import stat
+import shutil
+import tempfile
+import mock
+from libpkpass import identities
 from libpkpass.identities import IdentityDB
+from .basetest.basetest import captured_output
 
 class TestBasicFunction(unittest.TestCase):
     """This class tests the iddb class"""
@@ -10,6 +16,8 @@ class TestBasicFunction(unittest.TestCase):
         self.certdir = 'test/pki/intermediate/certs'
         self.keydir = 'test/pki/intermediate/private'
         self.cabundle = 'test/pki/intermediate/certs/ca-bundle'
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
 
     def test_certificate_loading(self):
         """Load a cert into our test"""
@@ -40,6 +48,61 @@ class TestBasicFunction(unittest.TestCase):
             assert os.path.isfile(idobj.iddb[identity]['certificate_path'])
             assert os.path.isfile(idobj.iddb[identity]['key_path'])
 
+    def test_dotted_uid_loading(self):
+        """Only the extension is stripped from a certificate name"""
+        shutil.copy(os.path.join(self.certdir, 'r1.cert'),
+                    os.path.join(self.tmpdir, 'first.last.cert'))
+        idobj = IdentityDB()
+        idobj.load_certs_from_directory(self.tmpdir)
+        assert list(idobj.iddb) == ['first.last']
+        assert idobj.iddb['first.last']['uid'] == 'first.last'
+
+    def test_verify_on_load_skips_bad_identity(self):
+        """A bad certificate does not stop the other identities loading"""
+        shutil.copy(os.path.join(self.certdir, 'r1.cert'), self.tmpdir)
+        shutil.copy(os.path.join(self.keydir, 'r2.key'),
+                    os.path.join(self.tmpdir, 'bad.cert'))
+        idobj = IdentityDB()
+        idobj.cabundle = self.cabundle
+        with captured_output():
+            idobj.load_certs_from_directory(self.tmpdir, verify_on_load=True)
+        assert idobj.iddb['r1']['certs'][0]['verified']
+        assert 'bad' in idobj.iddb
+
+    def test_verify_identity_cached(self):
+        """Verifying twice yields equal but independent cert details"""
+        idobj = IdentityDB()
+        idobj.cabundle = self.cabundle
+        idobj.load_certs_from_directory(self.certdir)
+        idobj.verify_identity('r1')
+        first = idobj.iddb['r1']['certs']
+        idobj.verify_identity('r1')
+        second = idobj.iddb['r1']['certs']
+        assert first == second
+        assert first[0] is not second[0]
+        assert second[0]['verified']
+
+    def test_nocache_clears_verification_cache(self):
+        """Loading with nocache re-verifies certificates"""
+        idobj = IdentityDB()
+        idobj.cabundle = self.cabundle
+        idobj.load_certs_from_directory(self.certdir, verify_on_load=True)
+        # pylint: disable=protected-access
+        assert identities._get_cert_details.cache_info().currsize > 0
+        idobj.load_certs_from_directory(self.certdir, nocache=True)
+        assert identities._get_cert_details.cache_info().currsize == 0
+
+    def test_write_cert_file(self):
+        """Connector certificates are world readable and failed writes leave nothing"""
+        # pylint: disable=protected-access
+        certfile = os.path.join(self.tmpdir, 'r1.cert')
+        identities._write_cert_file(certfile, b'cert')
+        assert stat.S_IMODE(os.stat(certfile).st_mode) == 0o644
+        with mock.patch.object(identities, 'replace', side_effect=OSError):
+            with self.assertRaises(OSError):
+                identities._write_cert_file(certfile, b'other')
+        assert os.listdir(self.tmpdir) == ['r1.cert']
+
 
 if __name__ == '__main__':
     unittest.main()
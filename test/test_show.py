@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """This module tests the show module"""
 import unittest
+import mock
 import libpkpass.commands.cli as cli
 import libpkpass.commands.show as show
 from libpkpass.errors import DecryptionError, CliArgumentError
@@ -52,6 +53,25 @@ class ShowErrors(unittest.TestCase):
             if str(error) == "'pwname'":
                 ret = str(error)
         self.assertEqual(ret, "'pwname'")
+    def test_passphrase_prompt(self):
+        """The pin/passphrase is prompted for once identities are valid"""
+        with mock.patch('getpass.getpass', return_value='pin') as getpass, \
+                mock.patch.object(show.Show, '_run_command_execution'):
+            with patch_args(subparser_name='show', identity='r1', nopassphrase=None,
+                            all=None, pwname='test'):
+                cli.Cli()
+        getpass.assert_called_once_with("Enter Pin/Passphrase: ")
+
+    def test_passphrase_prompt_invalid_identity(self):
+        """An invalid identity is reported before prompting for a pin/passphrase"""
+        with mock.patch('getpass.getpass', return_value='pin') as getpass:
+            with self.assertRaises(CliArgumentError) as context:
+                with patch_args(subparser_name='show', identity='bleh', nopassphrase=None,
+                                all=None, pwname='test'):
+                    cli.Cli()
+        self.assertEqual(context.exception.msg, ERROR_MSGS['rep'])
+        getpass.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""This Module tests the util module"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from libpkpass import util
+from libpkpass.util import get_config_args
+
+class TestBasicFunction(unittest.TestCase):
+    """This class tests the util functions"""
+    def setUp(self):
+        self.config = './test/.test_config'
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_config_cache(self):
+        """Repeated config loads are equal but not shared"""
+        config1 = get_config_args(self.config, {'verbosity': 0})
+        config1['certpath'] = 'changed'
+        config2 = get_config_args(self.config, {'verbosity': 0})
+        self.assertEqual(config2['certpath'], 'test/pki/intermediate/certs')
+
+    def test_stale_sidecar_ignored(self):
+        """A sidecar whose stats do not match the config is not used"""
+        config = os.path.join(self.tmpdir, '.pkpassrc')
+        with open(config, 'w') as fname:
+            fname.write('certpath: fromyaml\n')
+        stats = os.stat(config)
+        with open(config + '.cache', 'w') as fname:
+            json.dump({'mtime': stats.st_mtime - 10, 'size': stats.st_size,
+                       'config': {'certpath': 'fromcache'}}, fname)
+        util._YAML_CACHE.clear()  # pylint: disable=protected-access
+        config_args = get_config_args(config, {'verbosity': 0})
+        self.assertEqual(config_args['certpath'], 'fromyaml')
+        with open(config + '.cache', 'r') as fname:
+            self.assertEqual(json.load(fname)['config'], {'certpath': 'fromyaml'})
+
+
+if __name__ == '__main__':
+    unittest.main()